@@ -1,8 +1,14 @@
 import os
+import re
+import threading
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, repeat
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
-from dateutil import parser
-import isodate
 
 # CONFIG
 # These environment variables will be loaded from the Render.com environment
@@ -24,101 +30,230 @@ YOUTUBE_CHANNELS_ENDPOINT = "https://www.googleapis.com/youtube/v3/channels"
 YOUTUBE_PLAYLIST_ITEMS_ENDPOINT = "https://www.googleapis.com/youtube/v3/playlistItems"
 YOUTUBE_VIDEOS_ENDPOINT = "https://www.googleapis.com/youtube/v3/videos"
 
+
+def make_session(headers=None):
+    """
+    Builds a requests Session with a keep-alive connection pool, so repeated calls
+    to the same host reuse one TLS connection, and exponential backoff with jitter
+    (honouring Retry-After) for rate limits and transient server errors.
+    """
+    session = requests.Session()
+    # Google only compresses responses when the User-Agent also contains "gzip"
+    session.headers.update({
+        "Accept-Encoding": "gzip",
+        "User-Agent": f"{session.headers['User-Agent']} (gzip)"
+    })
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=8,
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "PATCH"]),
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_json(resp):
+    """
+    Decodes a response body with orjson, which is much faster than resp.json().
+    Decode errors are raised as requests' JSONDecodeError, like resp.json() does,
+    so the existing RequestException handlers still catch a bad body.
+    """
+    try:
+        return orjson.loads(resp.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+# One pooled session per host
+AIRTABLE_SESSION = make_session(HEADERS)
+YT_SESSION = make_session()
+
 # Set cutoff date for videos in the last 90 days
 CUTOFF_DATE = datetime.utcnow().replace(tzinfo=timezone.utc) - timedelta(days=90)
+CUTOFF_TS = CUTOFF_DATE.timestamp()
+
+# YouTube durations look like PT#H#M#S (P#D for days, P0D for live streams)
+DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+# Fields written when a channel has no recent long-form data
+EMPTY_FIELDS = {"LGVPV90": 0, "LGLPV90": 0, "LGCPV90": 0}
+
+# The only parts of an Airtable record the pipeline needs
+Job = namedtuple('Job', 'record_id channel_id playlist_id')
+
+# Airtable accepts at most 10 records per bulk update
+AIRTABLE_BATCH_SIZE = 10
+pending_updates = []
+pending_updates_lock = threading.Lock()
+failed_update_count = 0
+failed_update_lock = threading.Lock()
+
+# Airtable error types caused by a single record in a bulk update, rather than the whole request
+ROW_ERROR_TYPES = {"ROW_DOES_NOT_EXIST", "MODEL_ID_NOT_FOUND", "INVALID_RECORDS"}
 
-# Error handling configuration
+# Error handling configuration. Transient errors are retried by the sessions,
+# so only auth/quota failures count towards the limit.
 ERROR_LIMIT = 10
-error_count = 0
+HARD_ERROR_STATUSES = {401, 403}
 
 
-def get_airtable_records():
+class Breaker:
     """
-    Fetches all records from the specified Airtable view, handling pagination.
+    Thread-safe error counter that trips once `limit` errors have been recorded.
+    """
+
+    def __init__(self, limit):
+        self.count = 0
+        self.limit = limit
+        self.lock = threading.Lock()
+
+    def bump(self):
+        with self.lock:
+            self.count += 1
+
+    @property
+    def tripped(self):
+        with self.lock:
+            return self.count >= self.limit
+
+
+# Number of channels processed concurrently
+MAX_WORKERS = 16
+
+
+def get_airtable_record_pages():
+    """
+    Yields pages of records from the specified Airtable view, handling pagination,
+    so callers can start working on a page while the next one is fetched.
     """
-    records = []
     offset = None
     while True:
-        params = {"view": AIRTABLE_VIEW_NAME}
+        params = {"view": AIRTABLE_VIEW_NAME, "fields[]": ["YouTube Channel ID", "Uploads Playlist ID"]}
         if offset:
             params['offset'] = offset
         
         try:
-            resp = requests.get(AIRTABLE_ENDPOINT, headers=HEADERS, params=params)
+            resp = AIRTABLE_SESSION.get(AIRTABLE_ENDPOINT, params=params)
             resp.raise_for_status()
-            data = resp.json()
-            records.extend(data.get('records', []))
-            offset = data.get('offset')
-            if not offset:
-                break
+            data = parse_json(resp)
         except requests.RequestException as e:
             print(f"Error fetching Airtable records: {e}")
             break
-    return records
+        yield data.get('records', [])
+        offset = data.get('offset')
+        if not offset:
+            break
 
 
-def get_uploads_playlist_id(channel_id):
+def is_hard_error(e):
     """
-    Retrieves the 'uploads' playlist ID for a given YouTube channel ID.
+    Checks if a failed request was rejected for auth or quota reasons, which retrying cannot fix.
     """
-    global error_count
-    url = YOUTUBE_CHANNELS_ENDPOINT
-    params = {
-        "part": "contentDetails",
-        "id": channel_id,
-        "key": YOUTUBE_API_KEY
-    }
-    try:
-        resp = requests.get(url, params=params)
-        resp.raise_for_status()
-        items = resp.json().get('items', [])
-        if not items:
-            return None
-        return items[0]['contentDetails']['relatedPlaylists']['uploads']
-    except requests.RequestException as e:
-        error_count += 1
-        print(f"Error getting uploads playlist ID for channel {channel_id}: {e}")
-        return None
+    return e.response is not None and e.response.status_code in HARD_ERROR_STATUSES
+
+
+def iter_batches(items, size):
+    """
+    Yields successive lists of up to `size` items without re-slicing the source list.
+    """
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def valid_cached_playlist_id(channel_id, playlist_id):
+    """
+    Returns the cached uploads playlist ID if it still belongs to the channel, else None.
+    An uploads playlist ID is the channel ID with its 'UC' prefix swapped for 'UU'.
+    """
+    if channel_id.startswith('UC') and playlist_id == 'UU' + channel_id[2:]:
+        return playlist_id
+    return None
 
 
-def get_recent_video_ids(playlist_id):
+def get_uploads_playlists_batch(channel_ids, breaker):
+    """
+    Retrieves the 'uploads' playlist IDs for a list of YouTube channel IDs,
+    50 channels per request. Returns a {channel_id: playlist_id} dict and the
+    set of channel IDs whose batch request failed or was skipped.
+    """
+    playlists = {}
+    failed = set()
+    for batch in iter_batches(channel_ids, 50):
+        if breaker.tripped:
+            failed.update(batch)
+            continue
+        params = {
+            "part": "contentDetails",
+            "id": ",".join(batch),
+            "fields": "items(id,contentDetails/relatedPlaylists/uploads)",
+            "key": YOUTUBE_API_KEY
+        }
+        try:
+            resp = YT_SESSION.get(YOUTUBE_CHANNELS_ENDPOINT, params=params)
+            resp.raise_for_status()
+            for item in parse_json(resp).get('items', []):
+                uploads = ((item.get('contentDetails') or {}).get('relatedPlaylists') or {}).get('uploads')
+                if uploads:
+                    playlists[item['id']] = uploads
+        except requests.RequestException as e:
+            if is_hard_error(e):
+                breaker.bump()
+            print(f"Error getting uploads playlist IDs for channels {batch}: {e}")
+            failed.update(batch)
+    return playlists, failed
+
+
+def get_recent_video_ids(playlist_id, breaker):
     """
     Fetches video IDs from a playlist that were published within the CUTOFF_DATE.
+    Returns None if a request failed or the breaker tripped, so no partial list is used.
     """
-    global error_count
     video_ids = []
     next_page = None
     while True:
+        if breaker.tripped:
+            return None
         params = {
             "part": "contentDetails",
             "playlistId": playlist_id,
             "maxResults": 50,
+            "fields": "items(contentDetails(videoId,videoPublishedAt)),nextPageToken",
             "key": YOUTUBE_API_KEY
         }
         if next_page:
             params['pageToken'] = next_page
         
         try:
-            resp = requests.get(YOUTUBE_PLAYLIST_ITEMS_ENDPOINT, params=params)
+            resp = YT_SESSION.get(YOUTUBE_PLAYLIST_ITEMS_ENDPOINT, params=params)
             resp.raise_for_status()
-            data = resp.json()
+            data = parse_json(resp)
         except requests.RequestException as e:
-            error_count += 1
+            if is_hard_error(e):
+                breaker.bump()
             print(f"Error fetching recent video IDs from playlist {playlist_id}: {e}")
-            break
+            return None
 
-        recent_videos_found_in_page = False
+        # Uploads playlists are ordered newest first, so the first video older
+        # than the cutoff means every remaining item is older too.
         for item in data.get('items', []):
-            try:
-                published_at = parser.parse(item['contentDetails']['videoPublishedAt'])
-                if published_at >= CUTOFF_DATE:
-                    video_ids.append(item['contentDetails']['videoId'])
-                    recent_videos_found_in_page = True
-            except KeyError:
+            content_details = item.get('contentDetails') or {}
+            published_at = content_details.get('videoPublishedAt')
+            video_id = content_details.get('videoId')
+            if not published_at or not video_id:
                 continue
-
-        if not recent_videos_found_in_page and data.get('items'):
-            break
+            if datetime.fromisoformat(published_at.replace('Z', '+00:00')).timestamp() < CUTOFF_TS:
+                return video_ids
+            video_ids.append(video_id)
 
         next_page = data.get('nextPageToken')
         if not next_page:
@@ -127,27 +262,30 @@ def get_recent_video_ids(playlist_id):
     return video_ids
 
 
-def get_video_stats_batch(video_ids):
+def get_video_stats_batch(video_ids, breaker):
     """
     Fetches contentDetails and statistics for a batch of video IDs.
+    Returns None if a request failed or the breaker tripped, so no partial stats are used.
     """
-    global error_count
     stats_data = []
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i:i+50]
+    for batch in iter_batches(video_ids, 50):
+        if breaker.tripped:
+            return None
         params = {
             "part": "contentDetails,statistics",
             "id": ",".join(batch),
+            "fields": "items(id,contentDetails/duration,statistics(viewCount,likeCount,commentCount))",
             "key": YOUTUBE_API_KEY
         }
         try:
-            resp = requests.get(YOUTUBE_VIDEOS_ENDPOINT, params=params)
+            resp = YT_SESSION.get(YOUTUBE_VIDEOS_ENDPOINT, params=params)
             resp.raise_for_status()
-            stats_data.extend(resp.json().get('items', []))
+            stats_data.extend(parse_json(resp).get('items', []))
         except requests.RequestException as e:
-            error_count += 1
+            if is_hard_error(e):
+                breaker.bump()
             print(f"Error getting video stats for batch {batch}: {e}")
-            break
+            return None
     return stats_data
 
 
@@ -155,113 +293,249 @@ def is_longform(iso_duration):
     """
     Checks if a video's duration is 3 minutes (180 seconds) or longer.
     """
-    duration = isodate.parse_duration(iso_duration)
-    return duration.total_seconds() >= 180
+    if 'H' in iso_duration:
+        return True
+    match = DURATION_PATTERN.match(iso_duration)
+    if not match:
+        return False
+    days, hours, minutes, seconds = (int(x) if x else 0 for x in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds >= 180
 
 
-def update_airtable_record(record_id, fields_to_update):
+def send_airtable_updates(updates):
     """
-    Updates the specified Airtable record with multiple fields in a single call.
+    Sends a batch of up to 10 record updates to Airtable in a single PATCH.
     """
-    url = f"{AIRTABLE_ENDPOINT}/{record_id}"
     payload = {
-        "fields": fields_to_update
+        "records": updates,
+        "typecast": False
     }
     try:
-        resp = requests.patch(url, headers=HEADERS, json=payload)
+        resp = AIRTABLE_SESSION.patch(AIRTABLE_ENDPOINT, json=payload)
         resp.raise_for_status()
+        return
     except requests.RequestException as e:
-        print(f"Error updating Airtable record {record_id}: {e}")
+        record_ids = [update['id'] for update in updates]
+        print(f"Error updating Airtable records {record_ids}: {e}")
+        if len(updates) == 1 or not is_row_error(e):
+            record_failed_updates(len(updates))
+            return
+
+    # One invalid record (e.g. a deleted row) rejects the whole batch,
+    # so retry the records one at a time to save the valid ones
+    for update in updates:
+        try:
+            resp = AIRTABLE_SESSION.patch(
+                f"{AIRTABLE_ENDPOINT}/{update['id']}", json={"fields": update['fields'], "typecast": False}
+            )
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Error updating Airtable record {update['id']}: {e}")
+            record_failed_updates(1)
 
 
-def main():
+def is_row_error(e):
     """
-    Main function to orchestrate the fetching and updating process.
+    Checks if Airtable rejected a bulk update because of one of its records (e.g. a
+    deleted row), so retrying the other records individually can still succeed.
     """
-    print("Starting combined YouTube data update process...")
-    
-    # Check if environment variables are set before proceeding
-    if not all([AIRTABLE_API_KEY, AIRTABLE_BASE_ID, YOUTUBE_API_KEY]):
-        print("❌ Error: Missing one or more environment variables (AIRTABLE_API_KEY, AIRTABLE_BASE_ID, YOUTUBE_API_KEY). Please set them in the Render UI.")
-        return
+    if e.response is None:
+        return False
+    if e.response.status_code == 404:
+        return True
+    if e.response.status_code != 422:
+        return False
+    try:
+        error = parse_json(e.response).get('error')
+    except (requests.RequestException, AttributeError):
+        return False
+    return isinstance(error, dict) and error.get('type') in ROW_ERROR_TYPES
 
-    # --- 1. Fetch Airtable Records ---
-    records = get_airtable_records()
-    if not records:
-        print("No records found in Airtable to process.")
-        return
 
-    updated_count = 0
-    
-    for record in records:
-        if error_count >= ERROR_LIMIT:
-            print("❌ Too many YouTube API errors — stopping execution.")
-            break
+def record_failed_updates(count):
+    """
+    Counts Airtable updates that could not be written, so they are not reported as updated.
+    """
+    global failed_update_count
+    with failed_update_lock:
+        failed_update_count += count
 
-        channel_id = record['fields'].get('YouTube Channel ID')
-        if not channel_id:
-            print(f"Skipping record {record['id']}: No YouTube Channel ID found.")
-            continue
 
-        print(f"Processing channel ID: {channel_id} from record {record['id']}")
+def update_airtable_record(record_id, fields_to_update):
+    """
+    Queues an update for the specified Airtable record, sending the queue
+    as one request whenever it reaches Airtable's 10-record batch limit.
+    """
+    with pending_updates_lock:
+        pending_updates.append({"id": record_id, "fields": fields_to_update})
+        if len(pending_updates) < AIRTABLE_BATCH_SIZE:
+            return
+        updates = pending_updates[:]
+        pending_updates.clear()
+    send_airtable_updates(updates)
 
-        # --- 2. Get Uploads Playlist ID ---
-        playlist_id = get_uploads_playlist_id(channel_id)
-        if not playlist_id:
-            print(f"Could not get uploads playlist for channel {channel_id}.")
-            update_airtable_record(record['id'], {"LGVPV90": 0, "LGLPV90": 0, "LGCPV90": 0})
-            updated_count += 1
-            continue
 
-        # --- 3. Find Recent Video IDs ---
-        video_ids = get_recent_video_ids(playlist_id)
-        if not video_ids:
-            print(f"No recent videos found for channel {channel_id} in the last 90 days.")
-            update_airtable_record(record['id'], {"LGVPV90": 0, "LGLPV90": 0, "LGCPV90": 0})
-            updated_count += 1
+def flush_updates():
+    """
+    Sends any queued Airtable updates that have not filled a full batch yet.
+    """
+    with pending_updates_lock:
+        updates = pending_updates[:]
+        pending_updates.clear()
+    if updates:
+        send_airtable_updates(updates)
+
+
+def update_channel_records(jobs, fields_to_update, playlist_id):
+    """
+    Queues the same metrics for every record sharing a channel, caching the
+    uploads playlist ID on any record that does not have it yet.
+    """
+    for job in jobs:
+        if playlist_id and not job.playlist_id:
+            update_airtable_record(job.record_id, {**fields_to_update, "Uploads Playlist ID": playlist_id})
+        else:
+            update_airtable_record(job.record_id, fields_to_update)
+
+
+def process_channel(channel_id, jobs, uploads_playlists, failed_channel_ids, breaker):
+    """
+    Runs the full YouTube -> Airtable pipeline once for a channel and applies the
+    result to all of its records, using the pre-resolved uploads playlist IDs.
+    Channels with any failed YouTube request, or that were cut short by the breaker
+    tripping, are left untouched. Returns the number of Airtable records updated.
+    """
+    if breaker.tripped:
+        return 0
+
+    record_ids = [job.record_id for job in jobs]
+    print(f"Processing channel ID: {channel_id} from records {record_ids}")
+
+    # --- 2. Look up Uploads Playlist ID, preferring one cached in Airtable ---
+    playlist_id = next((job.playlist_id for job in jobs if job.playlist_id), None) or uploads_playlists.get(channel_id)
+    if not playlist_id and channel_id in failed_channel_ids:
+        print(f"Skipping channel {channel_id}: uploads playlist lookup failed.")
+        return 0
+    if not playlist_id:
+        print(f"Could not get uploads playlist for channel {channel_id}.")
+        update_channel_records(jobs, EMPTY_FIELDS, None)
+        return len(jobs)
+
+    # --- 3. Find Recent Video IDs ---
+    video_ids = get_recent_video_ids(playlist_id, breaker)
+    if video_ids is None:
+        print(f"Skipping channel {channel_id}: could not fetch its recent videos.")
+        return 0
+    if not video_ids:
+        print(f"No recent videos found for channel {channel_id} in the last 90 days.")
+        update_channel_records(jobs, EMPTY_FIELDS, playlist_id)
+        return len(jobs)
+
+    print(f"Found {len(video_ids)} recent videos for channel {channel_id}.")
+
+    # --- 4. Fetch All Stats in Batches ---
+    video_stats_list = get_video_stats_batch(video_ids, breaker)
+    if video_stats_list is None:
+        print(f"Skipping channel {channel_id}: could not fetch its video stats.")
+        return 0
+
+    # --- 5. Filter for Long-Form and accumulate stats ---
+    total_views = total_likes = total_comments = longform_count = 0
+
+    for item in video_stats_list:
+        duration = (item.get('contentDetails') or {}).get('duration')
+        statistics = item.get('statistics')
+        if not duration or statistics is None or not is_longform(duration):
             continue
-        
-        print(f"Found {len(video_ids)} recent videos for channel {channel_id}.")
+        total_views += int(statistics.get('viewCount', 0))
+        total_likes += int(statistics.get('likeCount', 0))
+        total_comments += int(statistics.get('commentCount', 0))
+        longform_count += 1
+
+    # --- 6. Calculate Averages ---
+    avg_views = total_views // longform_count if longform_count else 0
+    avg_likes = total_likes // longform_count if longform_count else 0
+    avg_comments = total_comments // longform_count if longform_count else 0
+
+    # --- 7. Update Airtable Records with all metrics ---
+    fields_to_update = {
+        "LGVPV90": avg_views,
+        "LGLPV90": avg_likes,
+        "LGCPV90": avg_comments
+    }
+    update_channel_records(jobs, fields_to_update, playlist_id)
 
-        # --- 4. Fetch All Stats in Batches ---
-        video_stats_list = get_video_stats_batch(video_ids)
-        
-        # --- 5. Filter for Long-Form and collect stats ---
-        longform_views = []
-        longform_likes = []
-        longform_comments = []
-
-        for item in video_stats_list:
-            try:
-                duration = item['contentDetails']['duration']
-                if is_longform(duration):
-                    views = int(item['statistics'].get('viewCount', 0))
-                    likes = int(item['statistics'].get('likeCount', 0))
-                    comments = int(item['statistics'].get('commentCount', 0))
-                    
-                    longform_views.append(views)
-                    longform_likes.append(likes)
-                    longform_comments.append(comments)
-            except KeyError:
-                continue
+    print(f"Updated records {record_ids} with Views: {avg_views}, Likes: {avg_likes}, Comments: {avg_comments}")
+    return len(jobs)
 
-        # --- 6. Calculate Averages ---
-        avg_views = int(sum(longform_views) / len(longform_views)) if longform_views else 0
-        avg_likes = int(sum(longform_likes) / len(longform_likes)) if longform_likes else 0
-        avg_comments = int(sum(longform_comments) / len(longform_comments)) if longform_comments else 0
 
-        # --- 7. Update Airtable Record with all metrics ---
-        fields_to_update = {
-            "LGVPV90": avg_views,
-            "LGLPV90": avg_likes,
-            "LGCPV90": avg_comments
-        }
-        update_airtable_record(record['id'], fields_to_update)
-        
-        print(f"Updated record {record['id']} with Views: {avg_views}, Likes: {avg_likes}, Comments: {avg_comments}")
-        updated_count += 1
+def main():
+    """
+    Main function to orchestrate the fetching and updating process.
+    """
+    print("Starting combined YouTube data update process...")
+    
+    # Check if environment variables are set before proceeding
+    if not all([AIRTABLE_API_KEY, AIRTABLE_BASE_ID, YOUTUBE_API_KEY]):
+        print("❌ Error: Missing one or more environment variables (AIRTABLE_API_KEY, AIRTABLE_BASE_ID, YOUTUBE_API_KEY). Please set them in the Render UI.")
+        return
 
-    print(f"✅ Total records updated: {updated_count}")
+    breaker = Breaker(ERROR_LIMIT)
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # --- 1. Fetch Airtable Records, resolving each page's uncached
+            # Uploads Playlist IDs (50 per call) while the next page downloads ---
+            # Duplicate rows for the same channel are grouped so it is only fetched once
+            channel_to_jobs = defaultdict(list)
+            seen_channel_ids = set()
+            playlist_lookups = []
+            for page in get_airtable_record_pages():
+                for record in page:
+                    if not record['fields'].get('YouTube Channel ID'):
+                        print(f"Skipping record {record['id']}: No YouTube Channel ID found.")
+                # Stale cached playlist IDs are dropped so they get re-resolved and rewritten
+                jobs = [
+                    Job(
+                        r['id'],
+                        r['fields']['YouTube Channel ID'],
+                        valid_cached_playlist_id(r['fields']['YouTube Channel ID'], r['fields'].get('Uploads Playlist ID'))
+                    )
+                    for r in page if r['fields'].get('YouTube Channel ID')
+                ]
+                for job in jobs:
+                    channel_to_jobs[job.channel_id].append(job)
+                channel_ids = list({job.channel_id for job in jobs if not job.playlist_id} - seen_channel_ids)
+                if channel_ids:
+                    seen_channel_ids.update(channel_ids)
+                    playlist_lookups.append(executor.submit(get_uploads_playlists_batch, channel_ids, breaker))
+
+            if not channel_to_jobs:
+                print("No records with a YouTube Channel ID found in Airtable to process.")
+                return
+
+            # --- 2. Collect resolved Uploads Playlist IDs ---
+            uploads_playlists = {}
+            failed_channel_ids = set()
+            for lookup in playlist_lookups:
+                playlists, failed = lookup.result()
+                uploads_playlists.update(playlists)
+                failed_channel_ids.update(failed)
+
+            # Channels are independent, so process them concurrently over the shared sessions
+            updated_count = sum(executor.map(
+                process_channel, channel_to_jobs.keys(), channel_to_jobs.values(),
+                repeat(uploads_playlists), repeat(failed_channel_ids), repeat(breaker)
+            ))
+    finally:
+        # Send whatever is still queued, even if a worker crashed
+        flush_updates()
+
+    if breaker.tripped:
+        print("❌ Too many YouTube API auth/quota errors — stopping execution.")
+
+    if failed_update_count:
+        print(f"❌ Failed to write {failed_update_count} Airtable records.")
+    print(f"✅ Total records updated: {updated_count - failed_update_count}")
     print("Combined data update process finished.")
 
 